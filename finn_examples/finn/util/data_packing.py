@@ -333,7 +333,12 @@ def rtlsim_output_to_npy(
 
 
 def finnpy_to_packed_bytearray(
-    ndarray, dtype, reverse_inner=False, reverse_endian=False, fast_mode=False
+    ndarray,
+    dtype,
+    reverse_inner=False,
+    reverse_endian=False,
+    fast_mode=False,
+    out=None,
 ):
     """Given a numpy ndarray with FINN DataType dtype, pack the innermost
     dimension and return the packed representation as an ndarray of uint8.
@@ -341,11 +346,17 @@ def finnpy_to_packed_bytearray(
     of 8 bits. The returned ndarray has the same number of dimensions as the
     input.
 
+    If out is specified (a uint8 ndarray of the packed shape), the packed
+    representation is written into it and out is returned.
+
     If fast_mode is enabled, will attempt to use shortcuts  to save
-    on runtime for certain cases:
-    * 8-bit ndarray -> 8-bit
-    * ndarray -> 1-bit and total bits % 8 == 0
-    This mode is currently not well-tested, use at your own risk!
+    on runtime for certain cases (all require reverse_inner and
+    reverse_endian, as used by the driver):
+    * 8-bit ndarray -> 8-bit: cast (values are not checked)
+    * ndarray -> 1-bit (BINARY/BIPOLAR), padded to a multiple of 8 bits
+      if needed: np.packbits
+    * ndarray -> any other integer type up to 32 bits: vectorized bit packing
+    These are checked against the non-fast path in tests/test_data_packing.py.
     """
 
     # handle fast_mode cases (currently only called from driver):
@@ -355,23 +366,36 @@ def finnpy_to_packed_bytearray(
         double_reverse = reverse_inner and reverse_endian
         # fast mode case: byte -> byte: cast
         if inp_is_byte and out_is_byte and double_reverse:
-            return ndarray.view(np.uint8)
-        # fast mode case: xxx -> bit with nbits % 8 == 0: np.packbits
+            return _copy_to_out(ndarray.view(np.uint8), out)
+        # fast mode case: xxx -> bit: np.packbits
         out_is_bit = dtype.bitwidth() == 1
         bits = dtype.bitwidth() * ndarray.shape[-1]
         bits_padded = roundup_to_integer_multiple(bits, 8)
-        no_pad = bits_padded == bits
-        if out_is_bit and no_pad and double_reverse:
+        if out_is_bit and double_reverse:
+            _check_fast_pack_values(ndarray, dtype)
             in_as_int8 = ndarray.astype(np.int8)
             # bipolar -> binary if needed
             if dtype == DataType["BIPOLAR"]:
                 in_as_int8 = (in_as_int8 + 1) // 2
+            # pad innermost dim with zero bits up to a multiple of 8
+            if bits_padded != bits:
+                pad = [(0, 0)] * (in_as_int8.ndim - 1) + [(0, bits_padded - bits)]
+                in_as_int8 = np.pad(in_as_int8, pad, mode="constant")
             # reverse inner
             in_as_int8 = np.flip(in_as_int8, axis=-1)
             # pack with numpy
             packed_data = np.packbits(in_as_int8, axis=-1)
             # reverse endianness and return
-            return np.flip(packed_data, axis=-1)
+            return _copy_to_out(np.flip(packed_data, axis=-1), out)
+        # fast mode case: any other integer type up to 32 bits (to fit the
+        # int64 temporaries), vectorized bit packing
+        fits_fast_int = dtype.is_integer() and dtype.bitwidth() <= 32
+        if fits_fast_int and double_reverse:
+            if out is not None and not out.flags.c_contiguous:
+                return _copy_to_out(
+                    _fast_pack_integer_innermost_dim(ndarray, dtype), out
+                )
+            return _fast_pack_integer_innermost_dim(ndarray, dtype, out=out)
 
     if (not issubclass(type(ndarray), np.ndarray)) or ndarray.dtype != np.float32:
         # try to convert to a float numpy array (container dtype is float)
@@ -395,7 +419,14 @@ def finnpy_to_packed_bytearray(
     if reverse_endian:
         # reverse the endianness of packing dimension
         ret = np.flip(ret, axis=-1)
-    return ret
+    return _copy_to_out(ret, out)
+
+
+def _copy_to_out(packed, out):
+    if out is None:
+        return packed
+    np.copyto(out, packed)
+    return out
 
 
 def packed_bytearray_to_finnpy(
@@ -412,9 +443,13 @@ def packed_bytearray_to_finnpy(
     output_shape can be specified to remove padding from the
     packed dimension, or set to None to be inferred from the input.
 
-    If fast_mode is enabled, will attempt to use shortcuts (casting) to save
-    on runtime for certain cases.
-    This mode is currently not well-tested, use at your own risk.
+    If fast_mode is enabled, will attempt to use shortcuts to save
+    on runtime for certain cases (all require reverse_inner and
+    reverse_endian, as used by the driver):
+    * 8/16-bit types without unpadding: cast
+    * 1-bit types (BINARY/BIPOLAR), unpadded if needed: np.unpackbits
+    * any other integer type up to 32 bits: vectorized bit unpacking
+    These are checked against the non-fast path in tests/test_data_packing.py.
 
     """
 
@@ -443,6 +478,21 @@ def packed_bytearray_to_finnpy(
         if no_unpad:
             as_np_type = packed_bytearray.view(dtype.to_numpy_dt())
             return as_np_type.reshape(output_shape).astype(np.float32)
+    # handle 1-bit types (if fast_mode) via np.unpackbits
+    if target_bits == 1 and double_reverse and fast_mode:
+        # reverse endianness, unpack with numpy, then reverse inner
+        unpacked = np.unpackbits(np.flip(packed_bytearray, axis=-1), axis=-1)
+        unpacked = np.flip(unpacked, axis=-1)[..., : output_shape[-1]]
+        ret = unpacked.reshape(output_shape).astype(np.float32)
+        # binary -> bipolar if needed
+        if dtype == DataType["BIPOLAR"]:
+            ret = 2 * ret - 1
+        return ret
+    # handle any other integer type up to 32 bits (if fast_mode) via vectorized
+    # bit unpacking
+    fits_fast_int = dtype.is_integer() and target_bits <= 32
+    if fits_fast_int and double_reverse and fast_mode:
+        return _fast_unpack_integer_innermost_dim(packed_bytearray, dtype, output_shape)
     if reverse_endian:
         packed_bytearray = np.flip(packed_bytearray, axis=-1)
     # convert innermost dim of byte array to hex strings
@@ -454,3 +504,102 @@ def packed_bytearray_to_finnpy(
     )
 
     return ret
+
+
+# number of elements processed at a time by the vectorized fast_mode
+# (un)packers, bounds the size of their temporaries on memory-constrained boards
+FAST_MODE_CHUNK_ELEMS = 1 << 16
+
+
+def _innermost_dim_chunks(n_rows, n_elems):
+    """Yield slices over the rows of an (n_rows, n_elems) array that cover about
+    FAST_MODE_CHUNK_ELEMS elements each."""
+    rows_per_chunk = max(1, FAST_MODE_CHUNK_ELEMS // max(1, n_elems))
+    for row in range(0, n_rows, rows_per_chunk):
+        yield slice(row, min(row + rows_per_chunk, n_rows))
+
+
+def _check_fast_pack_values(ndarray, dtype):
+    """Vectorized equivalent of the dtype.allowed check in array2hexstring."""
+    if dtype == DataType["BIPOLAR"]:
+        ok = np.all((ndarray == -1) | (ndarray == 1))
+    else:
+        in_range = (ndarray >= dtype.min()) & (ndarray <= dtype.max())
+        ok = np.all(in_range & (ndarray == np.round(ndarray)))
+    assert ok, "This value is not permitted by chosen dtype."
+
+
+def _fast_pack_integer_innermost_dim(ndarray, dtype, out=None):
+    """Vectorized equivalent of finnpy_to_packed_bytearray for integer dtypes
+    with reverse_inner=True and reverse_endian=True. In this layout, the packed
+    innermost dimension is a little-endian integer with element i occupying
+    bits [i*bitwidth, (i+1)*bitwidth). The result is written into out (a
+    C-contiguous uint8 array of the packed shape) if specified."""
+    ndarray = np.asarray(ndarray)
+    bw = dtype.bitwidth()
+    n_elems = ndarray.shape[-1]
+    bits = bw * n_elems
+    bits_padded = roundup_to_integer_multiple(bits, 8)
+    packed_shape = ndarray.shape[:-1] + (bits_padded // 8,)
+    if out is None:
+        out = np.empty(packed_shape, dtype=np.uint8)
+    assert out.shape == packed_shape and out.dtype == np.uint8
+    assert out.flags.c_contiguous, "out must be C-contiguous"
+    src = ndarray.reshape(-1, n_elems)
+    dst = out.reshape(-1, bits_padded // 8)
+    for rows in _innermost_dim_chunks(src.shape[0], n_elems):
+        _check_fast_pack_values(src[rows], dtype)
+        vals = src[rows].astype(np.int64)
+        if dtype == DataType["BIPOLAR"]:
+            # bipolar -> binary
+            vals = (vals + 1) // 2
+        # two's complement representation for signed types
+        vals &= (1 << bw) - 1
+        if bw in [8, 16, 32]:
+            # whole-byte elements: the layout is plain little-endian words
+            words = vals.astype("<u%d" % (bw // 8))
+            dst[rows] = words.view(np.uint8).reshape(words.shape[0], -1)
+            continue
+        # expand into individual bits, LSB first for each element
+        val_bits = np.zeros(vals.shape + (bw,), dtype=np.uint8)
+        for b in range(bw):
+            val_bits[..., b] = (vals >> b) & 1
+        val_bits = val_bits.reshape(vals.shape[0], bits)
+        if bits_padded != bits:
+            pad = [(0, 0), (0, bits_padded - bits)]
+            val_bits = np.pad(val_bits, pad, mode="constant")
+        # np.packbits is MSB-first within a byte, so flip each group of 8 bits
+        val_bits = val_bits.reshape(vals.shape[0], bits_padded // 8, 8)
+        dst[rows] = np.packbits(np.flip(val_bits, axis=-1), axis=-1)[..., 0]
+    return out
+
+
+def _fast_unpack_integer_innermost_dim(packed_bytearray, dtype, output_shape):
+    """Vectorized equivalent of packed_bytearray_to_finnpy for integer dtypes
+    with reverse_inner=True and reverse_endian=True, see
+    _fast_pack_integer_innermost_dim for the packed layout."""
+    bw = dtype.bitwidth()
+    n_elems = output_shape[-1]
+    src = packed_bytearray.reshape(-1, packed_bytearray.shape[-1])
+    ret = np.empty((src.shape[0], n_elems), dtype=np.float32)
+    for rows in _innermost_dim_chunks(src.shape[0], n_elems):
+        if bw in [8, 16, 32]:
+            # whole-byte elements: the layout is plain little-endian words
+            words = np.ascontiguousarray(src[rows, : n_elems * bw // 8])
+            vals = words.view("<u%d" % (bw // 8)).astype(np.int64)
+        else:
+            # np.unpackbits is MSB-first within a byte, so flip each group of 8
+            val_bits = np.unpackbits(src[rows][..., np.newaxis], axis=-1)
+            val_bits = np.flip(val_bits, axis=-1).reshape(val_bits.shape[0], -1)
+            val_bits = val_bits[:, : n_elems * bw].reshape(-1, n_elems, bw)
+            vals = np.zeros(val_bits.shape[:-1], dtype=np.int64)
+            for b in range(bw):
+                vals |= val_bits[..., b].astype(np.int64) << b
+        if dtype == DataType["BIPOLAR"]:
+            # binary -> bipolar
+            vals = 2 * vals - 1
+        elif dtype.signed():
+            # interpret two's complement representation
+            vals = vals - ((vals >> (bw - 1)) & 1) * (1 << bw)
+        ret[rows] = vals
+    return ret.reshape(output_shape)
@@ -0,0 +1,123 @@
+# Copyright (c) 2022 Xilinx, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of Xilinx nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import pytest
+
+import numpy as np
+
+from finn_examples.finn.util.data_packing import (
+    finnpy_to_packed_bytearray,
+    packed_bytearray_to_finnpy,
+)
+from finn_examples.qonnx.core.datatype import DataType
+from finn_examples.qonnx.util.basic import gen_finn_dt_tensor
+
+# the driver always packs with both reverse_inner and reverse_endian
+REV = dict(reverse_inner=True, reverse_endian=True)
+
+int_dtypes = ["BINARY", "BIPOLAR", "TERNARY"]
+for bw in [2, 3, 4, 5, 7, 8, 12, 16, 24, 32, 64]:
+    int_dtypes += ["UINT%d" % bw, "INT%d" % bw]
+
+# innermost dims of 8 elements are never padded, 5 and 1 are padded unless
+# the bitwidth is a multiple of 8
+shapes = [(2, 3, 8), (2, 3, 5), (4, 1), (1, 7)]
+
+
+def gen_tensor(dt, shape):
+    if dt.bitwidth() > 24:
+        # keep values exactly representable in the float32 container
+        lo = max(dt.min(), -(2**24))
+        hi = min(dt.max(), 2**24)
+        x = np.random.randint(lo, hi + 1, size=shape).astype(np.float32)
+        x.flat[0] = dt.min()
+        return x
+    return gen_finn_dt_tensor(dt, shape)
+
+
+@pytest.mark.parametrize("shape", shapes)
+@pytest.mark.parametrize("dtype", int_dtypes)
+def test_fast_pack_matches_slow(dtype, shape):
+    dt = DataType[dtype]
+    x = gen_tensor(dt, shape)
+    expected = finnpy_to_packed_bytearray(x, dt, **REV)
+    ret = finnpy_to_packed_bytearray(x, dt, fast_mode=True, **REV)
+    assert ret.dtype == np.uint8
+    assert ret.shape == expected.shape
+    assert (ret == expected).all()
+
+
+@pytest.mark.parametrize("shape", shapes)
+@pytest.mark.parametrize("dtype", int_dtypes)
+def test_fast_unpack_matches_slow(dtype, shape):
+    dt = DataType[dtype]
+    x = gen_tensor(dt, shape)
+    packed = finnpy_to_packed_bytearray(x, dt, **REV).astype(np.uint8)
+    ret = packed_bytearray_to_finnpy(packed, dt, shape, fast_mode=True, **REV)
+    assert ret.dtype == np.float32
+    assert (ret == x).all()
+    if dt != DataType["TERNARY"]:
+        # the hex string path does not sign-extend TERNARY values
+        expected = packed_bytearray_to_finnpy(packed, dt, shape, **REV)
+        assert (ret == expected).all()
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("dtype", ["UINT8", "BINARY", "BIPOLAR", "UINT4", "INT64"])
+def test_fast_pack_out(dtype, contiguous):
+    dt = DataType[dtype]
+    x = gen_tensor(dt, (3, 2, 5))
+    if dt == DataType["UINT8"]:
+        # exercise the byte -> byte cast
+        x = x.astype(np.uint8)
+    expected = finnpy_to_packed_bytearray(x, dt, **REV)
+    if contiguous:
+        out = np.zeros(expected.shape, dtype=np.uint8)
+    else:
+        out = np.zeros(expected.shape[:-1] + (2 * expected.shape[-1],), np.uint8)
+        out = out[..., ::2]
+    ret = finnpy_to_packed_bytearray(x, dt, fast_mode=True, out=out, **REV)
+    assert ret is out
+    assert (out == expected).all()
+
+
+@pytest.mark.parametrize(
+    "dtype, values",
+    [
+        ("UINT4", [1.5, 2.0]),
+        ("UINT4", [20.0, 1.0]),
+        ("INT4", [-9.0, 1.0]),
+        ("UINT4", [np.nan, 1.0]),
+        ("BINARY", [2.0, 1.0, 0.0]),
+        ("BIPOLAR", [0.0, 1.0, -1.0]),
+    ],
+)
+def test_fast_pack_rejects_invalid_values(dtype, values):
+    x = np.asarray([values], dtype=np.float32)
+    with pytest.raises(AssertionError, match="not permitted by chosen dtype"):
+        finnpy_to_packed_bytearray(x, DataType[dtype], fast_mode=True, **REV)